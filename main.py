@@ -1,63 +1,239 @@
-from fastapi import FastAPI, HTTPException, Query, Request
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
-import json
+import anyio
+import fcntl
+import logging
+import orjson
 import os
-import uuid
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse
-
-app = FastAPI(title="Employee Management API", version="1.0.0")
-
-# Custom middleware for logging and filtering invalid requests
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        client_ip = request.client.host
-        print(f"Incoming request: {request.method} {request.url} from {client_ip}")
-        
+import queue
+import re
+import sqlite3
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+# Request logging can be disabled entirely in production via API_REQUEST_LOGGING=0
+LOG_REQUESTS = os.getenv("API_REQUEST_LOGGING", "1") != "0"
+
+logger = logging.getLogger("api")
+
+def setup_logging() -> QueueListener:
+    # Route records through a queue so formatting and stdout writes happen on
+    # the listener thread instead of blocking the event loop.
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    return listener
+
+log_listener = setup_logging()
+
+app = FastAPI(title="Employee Management API", version="1.0.0", default_response_class=ORJSONResponse)
+
+# Compress bodies >=1 KB for clients that accept gzip; level 5 trades a
+# little ratio for much less CPU than the default 9. Registered first so it
+# runs innermost, compressing route responses before TLS encryption.
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=5)
+
+# Custom middleware for logging and filtering invalid requests.
+# Implemented as pure ASGI (no BaseHTTPMiddleware) to avoid the extra anyio
+# task and memory streams that dispatch() adds to every request.
+class LoggingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        client = scope.get("client")
+        client_ip = client[0] if client else "-"
+        if LOG_REQUESTS and logger.isEnabledFor(logging.INFO):
+            logger.info("Incoming request: %s %s from %s", scope["method"], scope["path"], client_ip)
+
         # Filter out invalid or suspicious requests
-        if not request.headers.get("user-agent") or "bot" in request.headers.get("user-agent", "").lower():
-            print(f"Blocked suspicious request from {client_ip}")
-            return JSONResponse(
-                status_code=400,
-                content={"message": "Invalid or suspicious request detected"}
-            )
-        
+        user_agent = b""
+        for name, value in scope["headers"]:
+            if name == b"user-agent":
+                user_agent = value
+                break
+        if not user_agent or b"bot" in user_agent.lower():
+            logger.warning("Blocked suspicious request from %s", client_ip)
+            body = orjson.dumps({"message": "Invalid or suspicious request detected"})
+            await send({
+                "type": "http.response.start",
+                "status": 400,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send)
         except Exception as e:
-            print(f"Error processing request from {client_ip}: {str(e)}")
+            logger.error("Error processing request from %s: %s", client_ip, str(e))
             raise
-        return response
 
 app.add_middleware(LoggingMiddleware)
 
-# CORS middleware setup for frontend integration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "https://preview--salom-panel-35.lovable.app",
-        "http://185.217.131.245:9008",
-        "http://localhost:9008"
-    ],
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["*"],
-    expose_headers=["Access-Control-Allow-Origin"],
-)
-
-# Data file paths
+# CORS setup for frontend integration. Pure-ASGI like LoggingMiddleware: the
+# allowed origins live in a frozenset checked only when an Origin header is
+# actually present, and same-origin traffic to the health endpoints skips the
+# middleware body entirely.
+ALLOWED_ORIGINS = frozenset({
+    b"https://preview--salom-panel-35.lovable.app",
+    b"http://185.217.131.245:9008",
+    b"http://localhost:9008",
+})
+_CORS_SKIP_PATHS = frozenset({"/", "/health"})
+_CORS_ALLOW_METHODS = b"GET, POST, PUT, DELETE, OPTIONS"
+
+class CORSMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in _CORS_SKIP_PATHS:
+            return await self.app(scope, receive, send)
+
+        origin = request_method = request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+        if origin is None or origin not in ALLOWED_ORIGINS:
+            return await self.app(scope, receive, send)
+
+        cors_headers = [
+            (b"access-control-allow-origin", origin),
+            (b"access-control-allow-credentials", b"true"),
+            (b"access-control-expose-headers", b"Access-Control-Allow-Origin"),
+            (b"vary", b"Origin"),
+        ]
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            # Preflight: answer directly without entering the router
+            headers = cors_headers + [
+                (b"access-control-allow-methods", _CORS_ALLOW_METHODS),
+                (b"access-control-max-age", b"600"),
+                (b"content-length", b"2"),
+            ]
+            if request_headers is not None:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b"OK"})
+            return
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + cors_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+app.add_middleware(CORSMiddleware)
+
+@app.on_event("startup")
+async def expand_threadpool():
+    # Sync (def) endpoints are dispatched to the anyio threadpool, whose
+    # default limit of 40 threads caps concurrent requests per worker.
+    anyio.to_thread.current_default_thread_limiter().total_tokens = 200
+
+# Persistence: SQLite in WAL mode. WAL gives concurrent readers alongside a
+# single writer and indexed lookups, replacing the old pattern of reading and
+# rewriting a whole JSON file for every O(1) change.
 DATA_DIR = "data"
+DB_FILE = os.path.join(DATA_DIR, "app.db")
+
+# Legacy JSON layouts, read once by the startup migration.
 DISTRICTS_FILE = os.path.join(DATA_DIR, "districts.json")
 DEPARTMENTS_FILE = os.path.join(DATA_DIR, "departments.json")
 EMPLOYEES_FILE = os.path.join(DATA_DIR, "employees.json")
+ATTENDANCE_DIR = os.path.join(DATA_DIR, "attendance")
 ATTENDANCE_FILE = os.path.join(DATA_DIR, "attendance.json")
 
 # Create data directory if it doesn't exist
 os.makedirs(DATA_DIR, exist_ok=True)
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS districts (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    code TEXT NOT NULL UNIQUE,
+    description TEXT DEFAULT '',
+    createdAt TEXT
+);
+CREATE TABLE IF NOT EXISTS departments (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    departmentNumber TEXT NOT NULL,
+    districtId TEXT NOT NULL,
+    districtName TEXT DEFAULT '',
+    manager TEXT NOT NULL,
+    employeeCount INTEGER DEFAULT 0,
+    description TEXT DEFAULT '',
+    createdAt TEXT,
+    UNIQUE (departmentNumber, districtId)
+);
+CREATE INDEX IF NOT EXISTS departments_district_idx ON departments (districtId);
+CREATE TABLE IF NOT EXISTS employees (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    phone TEXT NOT NULL UNIQUE,
+    photo TEXT DEFAULT '',
+    position TEXT NOT NULL,
+    departmentId TEXT NOT NULL,
+    departmentName TEXT DEFAULT '',
+    departmentNumber TEXT DEFAULT '',
+    districtName TEXT DEFAULT '',
+    email TEXT DEFAULT '',
+    status TEXT NOT NULL DEFAULT 'active',
+    createdAt TEXT
+);
+CREATE INDEX IF NOT EXISTS employees_department_idx ON employees (departmentId);
+CREATE TABLE IF NOT EXISTS attendance (
+    id TEXT PRIMARY KEY,
+    employeeName TEXT NOT NULL,
+    employeeId TEXT NOT NULL,
+    department TEXT,
+    date TEXT NOT NULL,
+    checkIn TEXT,
+    checkOut TEXT,
+    status TEXT NOT NULL,
+    workHours TEXT DEFAULT '0:00',
+    location TEXT,
+    UNIQUE (employeeId, date)
+);
+CREATE INDEX IF NOT EXISTS attendance_date_idx ON attendance (date);
+"""
+
+_local = threading.local()
+
+def get_db() -> sqlite3.Connection:
+    # One connection per threadpool thread; WAL lets readers proceed while a
+    # writer commits.
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_FILE)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _local.conn = conn
+    return conn
+
 # Pydantic models
 class District(BaseModel):
     id: Optional[str] = None
@@ -112,32 +288,76 @@ class AttendanceCreate(BaseModel):
     location: Optional[Dict] = None
 
 # Utility functions
-def load_json_data(file_path: str) -> List[Dict]:
-    if not os.path.exists(file_path):
-        return []
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"Error loading JSON from {file_path}: {str(e)}")
-        return []
 
-def save_json_data(file_path: str, data: List[Dict]):
-    try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        print(f"Error saving JSON to {file_path}: {str(e)}")
+_DISTRICT_INSERT = """INSERT INTO districts (id, name, code, description, createdAt)
+VALUES (:id, :name, :code, :description, :createdAt)"""
+
+_DEPARTMENT_INSERT = """INSERT INTO departments (id, name, departmentNumber, districtId, districtName,
+    manager, employeeCount, description, createdAt)
+VALUES (:id, :name, :departmentNumber, :districtId, :districtName,
+    :manager, :employeeCount, :description, :createdAt)"""
+
+_EMPLOYEE_INSERT = """INSERT INTO employees (id, name, phone, photo, position, departmentId,
+    departmentName, departmentNumber, districtName, email, status, createdAt)
+VALUES (:id, :name, :phone, :photo, :position, :departmentId,
+    :departmentName, :departmentNumber, :districtName, :email, :status, :createdAt)"""
+
+_ATTENDANCE_INSERT = """INSERT INTO attendance (id, employeeName, employeeId, department, date,
+    checkIn, checkOut, status, workHours, location)
+VALUES (:id, :employeeName, :employeeId, :department, :date,
+    :checkIn, :checkOut, :status, :workHours, :location)"""
+
+# Re-marking attendance for the same employee and date updates in place
+_ATTENDANCE_UPSERT = _ATTENDANCE_INSERT + """
+ON CONFLICT (employeeId, date) DO UPDATE SET
+    checkIn = excluded.checkIn,
+    checkOut = excluded.checkOut,
+    status = excluded.status,
+    workHours = excluded.workHours,
+    location = excluded.location"""
+
+# Columns clients may change through the PUT endpoints
+_UPDATABLE_COLUMNS = {
+    "districts": ("name", "code", "description", "createdAt"),
+    "departments": ("name", "departmentNumber", "districtId", "districtName",
+                    "manager", "employeeCount", "description", "createdAt"),
+    "employees": ("name", "phone", "photo", "position", "departmentId", "departmentName",
+                  "departmentNumber", "districtName", "email", "status", "createdAt"),
+}
+
+def update_row(db: sqlite3.Connection, table: str, row_id: str, data: Dict) -> Optional[sqlite3.Row]:
+    fields = [col for col in _UPDATABLE_COLUMNS[table] if col in data]
+    if fields:
+        assignments = ", ".join(f"{col} = :{col}" for col in fields)
+        db.execute(f"UPDATE {table} SET {assignments} WHERE id = :id",
+                   {**{col: data[col] for col in fields}, "id": row_id})
+    return db.execute(f"SELECT * FROM {table} WHERE id = ?", (row_id,)).fetchone()
+
+def rows_to_dicts(rows) -> List[Dict]:
+    return [dict(row) for row in rows]
+
+def attendance_to_dict(row: sqlite3.Row) -> Dict:
+    record = dict(row)
+    record['location'] = orjson.loads(record['location']) if record['location'] else None
+    return record
+
+def attendance_to_row(record: Dict) -> Dict:
+    location = record.get('location')
+    return {**record, 'location': orjson.dumps(location).decode() if location else None}
 
 def generate_id() -> str:
-    return str(uuid.uuid4())
+    # uuid7-style: a nanosecond timestamp prefix keeps ids sorted by creation
+    # time (better index locality than random uuid4), a random suffix keeps
+    # them unique. One urandom read and a hex encode — no UUID object, no
+    # Python-level bit twiddling.
+    return f"{time.time_ns():016x}{os.urandom(8).hex()}"
 
 def get_current_datetime() -> str:
     return datetime.now().isoformat()
 
 # Initialize sample data
-def initialize_sample_data():
-    if not os.path.exists(DISTRICTS_FILE):
+def initialize_sample_data(db: sqlite3.Connection):
+    if not db.execute("SELECT 1 FROM districts LIMIT 1").fetchone():
         sample_districts = [
             {
                 "id": "1",
@@ -154,9 +374,9 @@ def initialize_sample_data():
                 "createdAt": "2024-01-20T10:00:00"
             }
         ]
-        save_json_data(DISTRICTS_FILE, sample_districts)
+        db.executemany(_DISTRICT_INSERT, sample_districts)
 
-    if not os.path.exists(DEPARTMENTS_FILE):
+    if not db.execute("SELECT 1 FROM departments LIMIT 1").fetchone():
         sample_departments = [
             {
                 "id": "1",
@@ -192,9 +412,9 @@ def initialize_sample_data():
                 "createdAt": "2024-02-10T10:00:00"
             }
         ]
-        save_json_data(DEPARTMENTS_FILE, sample_departments)
+        db.executemany(_DEPARTMENT_INSERT, sample_departments)
 
-    if not os.path.exists(EMPLOYEES_FILE):
+    if not db.execute("SELECT 1 FROM employees LIMIT 1").fetchone():
         sample_employees = [
             {
                 "id": "1",
@@ -295,11 +515,12 @@ def initialize_sample_data():
                 "createdAt": "2024-02-21T10:00:00"
             }
         ]
-        save_json_data(EMPLOYEES_FILE, sample_employees)
+        db.executemany(_EMPLOYEE_INSERT, sample_employees)
 
-    if not os.path.exists(ATTENDANCE_FILE):
-        today = datetime.now().strftime('%Y-%m-%d')
-        yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+    if not db.execute("SELECT 1 FROM attendance LIMIT 1").fetchone():
+        now = datetime.now()
+        today = now.date().isoformat()
+        yesterday = (now - timedelta(days=1)).date().isoformat()
 
         sample_attendance = [
             {
@@ -387,106 +608,192 @@ def initialize_sample_data():
                 "location": {"latitude": 41.2995, "longitude": 69.2401, "address": "Toshkent"}
             }
         ]
-        save_json_data(ATTENDANCE_FILE, sample_attendance)
+        db.executemany(_ATTENDANCE_INSERT, [attendance_to_row(r) for r in sample_attendance])
+
+    db.commit()
 
-initialize_sample_data()
+def _read_legacy_json(file_path: str) -> List[Dict]:
+    try:
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
+    except Exception as e:
+        logger.error("Error reading legacy JSON from %s: %s", file_path, str(e))
+        return []
 
-class APIResponse(BaseModel):
-    success: bool
-    data: Any
-    message: Optional[str] = None
+# One-shot migration of the old JSON file layouts into SQLite. Imported files
+# are renamed to *.bak so reruns are no-ops.
+def migrate_json_to_sqlite(db: sqlite3.Connection):
+    for file_path, insert_sql in ((DISTRICTS_FILE, _DISTRICT_INSERT),
+                                  (DEPARTMENTS_FILE, _DEPARTMENT_INSERT),
+                                  (EMPLOYEES_FILE, _EMPLOYEE_INSERT)):
+        if not os.path.exists(file_path):
+            continue
+        logger.info("Importing %s into %s", file_path, DB_FILE)
+        db.executemany(insert_sql.replace("INSERT", "INSERT OR IGNORE", 1),
+                       _read_legacy_json(file_path))
+        os.replace(file_path, file_path + ".bak")
+
+    attendance_insert = _ATTENDANCE_INSERT.replace("INSERT", "INSERT OR IGNORE", 1)
+    if os.path.exists(ATTENDANCE_FILE):
+        logger.info("Importing %s into %s", ATTENDANCE_FILE, DB_FILE)
+        db.executemany(attendance_insert,
+                       [attendance_to_row(r) for r in _read_legacy_json(ATTENDANCE_FILE)])
+        os.replace(ATTENDANCE_FILE, ATTENDANCE_FILE + ".bak")
+    if os.path.isdir(ATTENDANCE_DIR):
+        for name in sorted(os.listdir(ATTENDANCE_DIR)):
+            day_file = os.path.join(ATTENDANCE_DIR, name)
+            if name.endswith('.json'):
+                day_records = _read_legacy_json(day_file)
+            elif name.endswith('.ndjson'):
+                # last line per employee wins, matching the NDJSON layout
+                by_employee: Dict[str, Dict] = {}
+                with open(day_file, 'rb') as f:
+                    for line in f:
+                        line = line.strip()
+                        if line:
+                            record = orjson.loads(line)
+                            by_employee[record['employeeId']] = record
+                day_records = list(by_employee.values())
+            else:
+                continue
+            logger.info("Importing %s into %s", day_file, DB_FILE)
+            db.executemany(attendance_insert, [attendance_to_row(r) for r in day_records])
+            os.replace(day_file, day_file + ".bak")
+
+    db.commit()
+
+# Hold an exclusive lock during schema creation, migration and seeding so
+# that multiple gunicorn workers starting at once don't race on first write.
+with open(os.path.join(DATA_DIR, ".init.lock"), 'w') as _lock_file:
+    fcntl.flock(_lock_file, fcntl.LOCK_EX)
+    _db = get_db()
+    _db.executescript(_SCHEMA)
+    _db.commit()
+    migrate_json_to_sqlite(_db)
+    initialize_sample_data(_db)
+    fcntl.flock(_lock_file, fcntl.LOCK_UN)
+
+# Dedicated connection for cache invalidation. PRAGMA data_version changes
+# whenever any *other* connection commits a write — another thread or another
+# gunicorn worker — and this connection never writes, so the value moves on
+# every committed write in the deployment. The lock is needed because the
+# connection is shared across the threadpool.
+_version_conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+_version_lock = threading.Lock()
+
+def db_data_version() -> int:
+    with _version_lock:
+        return _version_conn.execute("PRAGMA data_version").fetchone()[0]
+
+def api_response(data: Any, message: Optional[str] = None) -> ORJSONResponse:
+    # Build the response envelope once and hand it straight to orjson,
+    # skipping the model validation and jsonable_encoder pass FastAPI would
+    # otherwise run on every return value.
+    return ORJSONResponse({"success": True, "data": data, "message": message})
 
 @app.get("/districts")
-async def get_districts():
-    districts = load_json_data(DISTRICTS_FILE)
-    return APIResponse(success=True, data=districts)
+def get_districts():
+    districts = rows_to_dicts(get_db().execute("SELECT * FROM districts"))
+    return api_response(districts)
 
 @app.post("/districts")
-async def create_district(district: District):
-    districts = load_json_data(DISTRICTS_FILE)
-    if any(d['code'] == district.code for d in districts):
-        raise HTTPException(status_code=400, detail="Bu kod allaqachon mavjud")
+def create_district(district: District):
     new_district = district.model_dump()
     new_district['id'] = generate_id()
     new_district['createdAt'] = get_current_datetime()
-    districts.append(new_district)
-    save_json_data(DISTRICTS_FILE, districts)
-    return APIResponse(success=True, data=new_district, message="Tuman muvaffaqiyatli qo'shildi")
+    db = get_db()
+    try:
+        db.execute(_DISTRICT_INSERT, new_district)
+    except sqlite3.IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Bu kod allaqachon mavjud")
+    db.commit()
+    return api_response(new_district, message="Tuman muvaffaqiyatli qo'shildi")
 
 @app.put("/districts/{district_id}")
-async def update_district(district_id: str, district_data: Dict):
-    districts = load_json_data(DISTRICTS_FILE)
-    for i, d in enumerate(districts):
-        if d['id'] == district_id:
-            districts[i].update(district_data)
-            save_json_data(DISTRICTS_FILE, districts)
-            return APIResponse(success=True, data=districts[i], message="Tuman yangilandi")
-    raise HTTPException(status_code=404, detail="Tuman topilmadi")
+def update_district(district_id: str, district_data: Dict):
+    db = get_db()
+    try:
+        district = update_row(db, "districts", district_id, district_data)
+    except sqlite3.IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Bu kod allaqachon mavjud")
+    if not district:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Tuman topilmadi")
+    db.commit()
+    return api_response(dict(district), message="Tuman yangilandi")
 
 @app.delete("/districts/{district_id}")
-async def delete_district(district_id: str):
-    districts = load_json_data(DISTRICTS_FILE)
-    departments = load_json_data(DEPARTMENTS_FILE)
-    if any(dept['districtId'] == district_id for dept in departments):
+def delete_district(district_id: str):
+    db = get_db()
+    if db.execute("SELECT 1 FROM departments WHERE districtId = ? LIMIT 1", (district_id,)).fetchone():
         raise HTTPException(status_code=400, detail="Bu tumanda bo'limlar mavjud")
-    districts = [d for d in districts if d['id'] != district_id]
-    save_json_data(DISTRICTS_FILE, districts)
-    return APIResponse(success=True, data=None, message="Tuman o'chirildi")
+    db.execute("DELETE FROM districts WHERE id = ?", (district_id,))
+    db.commit()
+    return api_response(None, message="Tuman o'chirildi")
 
 @app.get("/departments")
-async def get_departments():
-    departments = load_json_data(DEPARTMENTS_FILE)
-    return APIResponse(success=True, data=departments)
+def get_departments():
+    departments = rows_to_dicts(get_db().execute("SELECT * FROM departments"))
+    return api_response(departments)
 
 @app.post("/departments")
-async def create_department(department: Department):
-    departments = load_json_data(DEPARTMENTS_FILE)
-    districts = load_json_data(DISTRICTS_FILE)
-    if any(d['departmentNumber'] == department.departmentNumber and d['districtId'] == department.districtId for d in departments):
+def create_department(department: Department):
+    db = get_db()
+    if db.execute("SELECT 1 FROM departments WHERE departmentNumber = ? AND districtId = ?",
+                  (department.departmentNumber, department.districtId)).fetchone():
         raise HTTPException(status_code=400, detail="Bu bo'lim raqami allaqachon mavjud")
-    district = next((d for d in districts if d['id'] == department.districtId), None)
+    district = db.execute("SELECT name FROM districts WHERE id = ?", (department.districtId,)).fetchone()
     if not district:
         raise HTTPException(status_code=404, detail="Tuman topilmadi")
     new_department = department.model_dump()
     new_department['id'] = generate_id()
     new_department['districtName'] = district['name']
     new_department['createdAt'] = get_current_datetime()
-    departments.append(new_department)
-    save_json_data(DEPARTMENTS_FILE, departments)
-    return APIResponse(success=True, data=new_department, message="Bo'lim muvaffaqiyatli qo'shildi")
+    try:
+        db.execute(_DEPARTMENT_INSERT, new_department)
+    except sqlite3.IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Bu bo'lim raqami allaqachon mavjud")
+    db.commit()
+    return api_response(new_department, message="Bo'lim muvaffaqiyatli qo'shildi")
 
 @app.put("/departments/{department_id}")
-async def update_department(department_id: str, department_data: Dict):
-    departments = load_json_data(DEPARTMENTS_FILE)
-    for i, d in enumerate(departments):
-        if d['id'] == department_id:
-            departments[i].update(department_data)
-            save_json_data(DEPARTMENTS_FILE, departments)
-            return APIResponse(success=True, data=departments[i], message="Bo'lim yangilandi")
-    raise HTTPException(status_code=404, detail="Bo'lim topilmadi")
+def update_department(department_id: str, department_data: Dict):
+    db = get_db()
+    try:
+        department = update_row(db, "departments", department_id, department_data)
+    except sqlite3.IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Bu bo'lim raqami allaqachon mavjud")
+    if not department:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Bo'lim topilmadi")
+    db.commit()
+    return api_response(dict(department), message="Bo'lim yangilandi")
 
 @app.delete("/departments/{department_id}")
-async def delete_department(department_id: str):
-    departments = load_json_data(DEPARTMENTS_FILE)
-    employees = load_json_data(EMPLOYEES_FILE)
-    if any(emp['departmentId'] == department_id for emp in employees):
+def delete_department(department_id: str):
+    db = get_db()
+    if db.execute("SELECT 1 FROM employees WHERE departmentId = ? LIMIT 1", (department_id,)).fetchone():
         raise HTTPException(status_code=400, detail="Bu bo'limda ishchilar mavjud")
-    departments = [d for d in departments if d['id'] != department_id]
-    save_json_data(DEPARTMENTS_FILE, departments)
-    return APIResponse(success=True, data=None, message="Bo'lim o'chirildi")
+    db.execute("DELETE FROM departments WHERE id = ?", (department_id,))
+    db.commit()
+    return api_response(None, message="Bo'lim o'chirildi")
 
 @app.get("/employees")
-async def get_employees():
-    employees = load_json_data(EMPLOYEES_FILE)
-    return APIResponse(success=True, data=employees)
+def get_employees():
+    employees = rows_to_dicts(get_db().execute("SELECT * FROM employees"))
+    return api_response(employees)
 
 @app.post("/employees")
-async def create_employee(employee: Employee):
-    employees = load_json_data(EMPLOYEES_FILE)
-    departments = load_json_data(DEPARTMENTS_FILE)
-    if any(emp['phone'] == employee.phone for emp in employees):
+def create_employee(employee: Employee):
+    db = get_db()
+    if db.execute("SELECT 1 FROM employees WHERE phone = ?", (employee.phone,)).fetchone():
         raise HTTPException(status_code=400, detail="Bu telefon raqami allaqachon mavjud")
-    department = next((d for d in departments if d['id'] == employee.departmentId), None)
+    department = db.execute("SELECT name, departmentNumber, districtName FROM departments WHERE id = ?",
+                            (employee.departmentId,)).fetchone()
     if not department:
         raise HTTPException(status_code=404, detail="Bo'lim topilmadi")
     new_employee = employee.model_dump()
@@ -495,117 +802,120 @@ async def create_employee(employee: Employee):
     new_employee['departmentNumber'] = department['departmentNumber']
     new_employee['districtName'] = department['districtName']
     new_employee['createdAt'] = get_current_datetime()
-    employees.append(new_employee)
-    save_json_data(EMPLOYEES_FILE, employees)
-    departments = load_json_data(DEPARTMENTS_FILE)
-    for i, d in enumerate(departments):
-        if d['id'] == employee.departmentId:
-            departments[i]['employeeCount'] = departments[i].get('employeeCount', 0) + 1
-            break
-    save_json_data(DEPARTMENTS_FILE, departments)
-    return APIResponse(success=True, data=new_employee, message="Ishchi muvaffaqiyatli qo'shildi")
+    try:
+        db.execute(_EMPLOYEE_INSERT, new_employee)
+    except sqlite3.IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Bu telefon raqami allaqachon mavjud")
+    db.execute("UPDATE departments SET employeeCount = COALESCE(employeeCount, 0) + 1 WHERE id = ?",
+               (employee.departmentId,))
+    db.commit()
+    return api_response(new_employee, message="Ishchi muvaffaqiyatli qo'shildi")
 
 @app.put("/employees/{employee_id}")
-async def update_employee(employee_id: str, employee_data: Dict):
-    employees = load_json_data(EMPLOYEES_FILE)
-    for i, emp in enumerate(employees):
-        if emp['id'] == employee_id:
-            employees[i].update(employee_data)
-            save_json_data(EMPLOYEES_FILE, employees)
-            return APIResponse(success=True, data=employees[i], message="Ishchi ma'lumotlari yangilandi")
-    raise HTTPException(status_code=404, detail="Ishchi topilmadi")
+def update_employee(employee_id: str, employee_data: Dict):
+    db = get_db()
+    try:
+        employee = update_row(db, "employees", employee_id, employee_data)
+    except sqlite3.IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Bu telefon raqami allaqachon mavjud")
+    if not employee:
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Ishchi topilmadi")
+    db.commit()
+    return api_response(dict(employee), message="Ishchi ma'lumotlari yangilandi")
 
 @app.delete("/employees/{employee_id}")
-async def delete_employee(employee_id: str):
-    employees = load_json_data(EMPLOYEES_FILE)
-    departments = load_json_data(DEPARTMENTS_FILE)
-    employee = next((emp for emp in employees if emp['id'] == employee_id), None)
+def delete_employee(employee_id: str):
+    db = get_db()
+    employee = db.execute("SELECT departmentId FROM employees WHERE id = ?", (employee_id,)).fetchone()
     if not employee:
         raise HTTPException(status_code=404, detail="Ishchi topilmadi")
-    employees = [emp for emp in employees if emp['id'] != employee_id]
-    save_json_data(EMPLOYEES_FILE, employees)
-    for i, d in enumerate(departments):
-        if d['id'] == employee['departmentId']:
-            departments[i]['employeeCount'] = max(0, departments[i].get('employeeCount', 1) - 1)
-            break
-    save_json_data(DEPARTMENTS_FILE, departments)
-    return APIResponse(success=True, data=None, message="Ishchi o'chirildi")
+    db.execute("DELETE FROM employees WHERE id = ?", (employee_id,))
+    db.execute("UPDATE departments SET employeeCount = MAX(0, COALESCE(employeeCount, 1) - 1) WHERE id = ?",
+               (employee['departmentId'],))
+    db.commit()
+    return api_response(None, message="Ishchi o'chirildi")
+
+# Dates are keys into the attendance table, so reject anything that isn't
+# the documented YYYY-MM-DD format before it reaches storage.
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 
 @app.get("/attendance")
-async def get_attendance(date: str = Query(..., description="Sana YYYY-MM-DD formatida")):
-    attendance_records = load_json_data(ATTENDANCE_FILE)
-    filtered_records = [record for record in attendance_records if record['date'] == date]
-    return APIResponse(success=True, data=filtered_records)
+def get_attendance(date: str = Query(..., description="Sana YYYY-MM-DD formatida")):
+    if not _DATE_RE.match(date):
+        raise HTTPException(status_code=400, detail="Sana YYYY-MM-DD formatida bo'lishi kerak")
+    rows = get_db().execute("SELECT * FROM attendance WHERE date = ?", (date,))
+    return api_response([attendance_to_dict(row) for row in rows])
 
 @app.post("/attendance")
-async def mark_attendance(attendance: AttendanceCreate):
-    attendance_records = load_json_data(ATTENDANCE_FILE)
-    employees = load_json_data(EMPLOYEES_FILE)
-    employee = next((emp for emp in employees if emp['id'] == attendance.employeeId), None)
+def mark_attendance(attendance: AttendanceCreate):
+    if not _DATE_RE.match(attendance.date):
+        raise HTTPException(status_code=400, detail="Sana YYYY-MM-DD formatida bo'lishi kerak")
+    db = get_db()
+    employee = db.execute("SELECT name, departmentName FROM employees WHERE id = ?",
+                          (attendance.employeeId,)).fetchone()
     if not employee:
         raise HTTPException(status_code=404, detail="Ishchi topilmadi")
-    existing_record = next((record for record in attendance_records
-                           if record['employeeId'] == attendance.employeeId and record['date'] == attendance.date), None)
-    if existing_record:
-        for i, record in enumerate(attendance_records):
-            if record['id'] == existing_record['id']:
-                attendance_records[i].update({
-                    'checkIn': attendance.checkIn,
-                    'checkOut': attendance.checkOut,
-                    'status': attendance.status,
-                    'location': attendance.location,
-                    'workHours': calculate_work_hours(attendance.checkIn, attendance.checkOut)
-                })
-                break
-    else:
-        new_record = {
-            'id': generate_id(),
-            'employeeName': employee['name'],
-            'employeeId': attendance.employeeId,
-            'department': employee['departmentName'],
-            'date': attendance.date,
-            'checkIn': attendance.checkIn,
-            'checkOut': attendance.checkOut,
-            'status': attendance.status,
-            'workHours': calculate_work_hours(attendance.checkIn, attendance.checkOut),
-            'location': attendance.location
-        }
-        attendance_records.append(new_record)
-    save_json_data(ATTENDANCE_FILE, attendance_records)
-    return APIResponse(success=True, data=None, message="Davomat belgilandi")
+    record = attendance_to_row({
+        'id': generate_id(),
+        'employeeName': employee['name'],
+        'employeeId': attendance.employeeId,
+        'department': employee['departmentName'],
+        'date': attendance.date,
+        'checkIn': attendance.checkIn,
+        'checkOut': attendance.checkOut,
+        'status': attendance.status,
+        'workHours': calculate_work_hours(attendance.checkIn, attendance.checkOut),
+        'location': attendance.location
+    })
+    db.execute(_ATTENDANCE_UPSERT, record)
+    db.commit()
+    return api_response(None, message="Davomat belgilandi")
+
+# Times are a fixed "HH:MM" format, so validate with one compiled regex and
+# parse with int slicing — datetime.strptime costs ~100x more per call.
+_TIME_RE = re.compile(r"^([01]\d|2[0-3]):[0-5]\d$")
 
 def calculate_work_hours(check_in: Optional[str], check_out: Optional[str]) -> str:
     if not check_in or not check_out:
         return "0:00"
-    try:
-        check_in_time = datetime.strptime(check_in, "%H:%M")
-        check_out_time = datetime.strptime(check_out, "%H:%M")
-        if check_out_time > check_in_time:
-            diff = check_out_time - check_in_time
-            if diff.seconds > 6 * 3600:
-                diff = diff - timedelta(hours=1)
-            hours = diff.seconds // 3600
-            minutes = (diff.seconds % 3600) // 60
-            return f"{hours}:{minutes:02d}"
-    except ValueError:
+    if not _TIME_RE.match(check_in) or not _TIME_RE.match(check_out):
         return "0:00"
-    return "0:00"
+    delta_min = (int(check_out[:2]) * 60 + int(check_out[3:5])) - (int(check_in[:2]) * 60 + int(check_in[3:5]))
+    if delta_min <= 0:
+        return "0:00"
+    # lunch break: over six hours of presence counts one hour less
+    if delta_min > 360:
+        delta_min -= 60
+    return f"{delta_min // 60}:{delta_min % 60:02d}"
+
+# Memoized /statistics payload, keyed on the date and SQLite's data_version
+# so it stays valid until any worker actually commits a change.
+_STATS_CACHE: tuple = ()
 
 @app.get("/statistics")
-async def get_statistics(period: Optional[str] = Query("monthly", description="Davr: daily, weekly, monthly, yearly")):
-    employees = load_json_data(EMPLOYEES_FILE)
-    departments = load_json_data(DEPARTMENTS_FILE)
-    districts = load_json_data(DISTRICTS_FILE)
-    attendance_records = load_json_data(ATTENDANCE_FILE)
-    total_employees = len(employees)
-    active_employees = len([emp for emp in employees if emp['status'] == 'active'])
-    total_departments = len(departments)
-    total_districts = len(districts)
-    today = datetime.now().strftime('%Y-%m-%d')
-    today_attendance = [record for record in attendance_records if record['date'] == today]
-    present_today = len([record for record in today_attendance if record['status'] == 'present'])
-    late_today = len([record for record in today_attendance if record['status'] == 'late'])
-    absent_today = len([record for record in today_attendance if record['status'] == 'absent'])
+def get_statistics(period: Optional[str] = Query("monthly", description="Davr: daily, weekly, monthly, yearly")):
+    global _STATS_CACHE
+    # isoformat() on the date is a straight format, ~2x faster than strftime
+    today = datetime.now().date().isoformat()
+    cache_key = (today, db_data_version())
+    if _STATS_CACHE and _STATS_CACHE[0] == cache_key:
+        return api_response(_STATS_CACHE[1])
+    db = get_db()
+    total_employees = db.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
+    active_employees = db.execute("SELECT COUNT(*) FROM employees WHERE status = 'active'").fetchone()[0]
+    total_departments = db.execute("SELECT COUNT(*) FROM departments").fetchone()[0]
+    total_districts = db.execute("SELECT COUNT(*) FROM districts").fetchone()[0]
+    status_counts = {'present': 0, 'late': 0, 'absent': 0}
+    for status, count in db.execute("SELECT status, COUNT(*) FROM attendance WHERE date = ? GROUP BY status",
+                                    (today,)):
+        if status in status_counts:
+            status_counts[status] = count
+    present_today = status_counts['present']
+    late_today = status_counts['late']
+    absent_today = status_counts['absent']
     attendance_percentage = (present_today + late_today) / max(total_employees, 1) * 100 if total_employees > 0 else 0
     late_percentage = late_today / max(total_employees, 1) * 100 if total_employees > 0 else 0
     attendance_chart_data = [
@@ -617,10 +927,10 @@ async def get_statistics(period: Optional[str] = Query("monthly", description="D
     ]
     department_chart_data = []
     colors = ['#8b5cf6', '#06b6d4', '#10b981', '#f59e0b', '#ef4444', '#8b5a2b']
-    for i, dept in enumerate(departments):
+    for i, dept in enumerate(db.execute("SELECT name, employeeCount, districtId FROM departments")):
         department_chart_data.append({
             "name": dept['name'],
-            "value": dept.get('employeeCount', 0),
+            "value": dept['employeeCount'] or 0,
             "color": colors[i % len(colors)],
             "districtId": dept['districtId']
         })
@@ -673,7 +983,8 @@ async def get_statistics(period: Optional[str] = Query("monthly", description="D
             }
         ]
     }
-    return APIResponse(success=True, data=statistics_data)
+    _STATS_CACHE = (cache_key, statistics_data)
+    return api_response(statistics_data)
 
 @app.get("/")
 async def health_check():
@@ -683,6 +994,13 @@ async def health_check():
 async def health():
     return {"status": "healthy"}
 
+# Production deployment: run one worker per core (2n+1) under gunicorn so
+# CPU-bound JSON work scales past the GIL of a single process:
+#   gunicorn main:app -k uvicorn.workers.UvicornWorker -w $((2 * $(nproc) + 1)) \
+#       --bind 0.0.0.0:9092 --keep-alive 15 \
+#       --keyfile /etc/letsencrypt/live/185.217.131.245/privkey.pem \
+#       --certfile /etc/letsencrypt/live/185.217.131.245/fullchain.pem
+# The __main__ block below stays as the single-process development entrypoint.
 if __name__ == "__main__":
     import uvicorn
     print("🚀 Employee Management API ishga tushmoqda...")
@@ -692,8 +1010,10 @@ if __name__ == "__main__":
         app,
         host="0.0.0.0",
         port=9092,
-        timeout_keep_alive=0,
-        log_level="debug",
+        loop="uvloop",
+        http="httptools",
+        timeout_keep_alive=15,
+        log_level="info",
         ssl_keyfile="/etc/letsencrypt/live/185.217.131.245/privkey.pem",
         ssl_certfile="/etc/letsencrypt/live/185.217.131.245/fullchain.pem"
     )